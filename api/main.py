@@ -3,51 +3,112 @@ FastAPI Main Application
 URL Shortener with Custom DSA Implementations
 """
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi.responses import RedirectResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl, validator
 import uvicorn
 from typing import Optional
+from urllib.parse import urlsplit
+import asyncio
 import re
+import time
+from functools import wraps
+from contextlib import asynccontextmanager
 
 # Import custom DSA modules
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dsa_modules.hash_map import HashMap
 from dsa_modules.base62_codec import Base62Codec
-from dsa_modules.lru_cache import LRUCache
 from dsa_modules.trie import Trie
 from dsa_modules.min_heap import TopKURLs
 from dsa_modules.collision_detector import CollisionDetector
+from dsa_modules.sharded import ShardedHashMap, ShardedLRUCache
 from config.database import db
-from config.app_config import API_BASE_URL
+from config.app_config import API_BASE, CORS_ORIGINS, APP_TITLE, APP_VERSION
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Application lifespan: open the DB pool, load the HashMap, warm up the
+    Trie and Top K in the background while serving, then stop warmup and
+    close the pool on shutdown
+    """
+    print("🚀 Starting TinyURL application...")
+    
+    # Open the connection pool before any query runs; a missing or wrong
+    # DATABASE_URL aborts startup instead of serving 500s on every request
+    await db.connect()
+    
+    # Short codes must all be known before the first shorten is served;
+    # search and ranking structures can fill in while requests run
+    rows = await preload_hash_map()
+    preload_task = asyncio.create_task(preload_search_structures(rows))
+    
+    yield
+    
+    # Wait for warmup to actually stop before its connection is closed
+    preload_task.cancel()
+    await asyncio.gather(preload_task, return_exceptions=True)
+    await db.close()
+
 
 # Initialize FastAPI app
 app = FastAPI(
-    title="TinyURL - Custom DSA Implementation",
+    title=APP_TITLE,
     description="URL Shortener with custom Hash Map, LRU Cache, Trie, Min Heap, and Collision Detection",
-    version="1.0.0"
+    version=APP_VERSION,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS middleware
+# CORS middleware (explicit allow-list, no wildcard origin echoing)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=list(CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 # Initialize DSA structures
-hash_map = HashMap(initial_capacity=1000)
-lru_cache = LRUCache(capacity=100)
+# HashMap and LRU caches are split into 16 independently locked shards
+hash_map = ShardedHashMap(num_shards=16, initial_capacity=1000)
+lru_cache = ShardedLRUCache(num_shards=16, capacity=100)         # original_url -> short_code
+redirect_cache = ShardedLRUCache(num_shards=16, capacity=1000)   # short_code -> original_url
 trie = Trie()
 top_k_urls = TopKURLs(k=10)
 collision_detector = CollisionDetector(hash_map)
 
+# Any whitespace makes a URL invalid; one compiled search scans it in C
+_WHITESPACE_RE = re.compile(r'\s')
+
+
+def ttl_cache(seconds):
+    """
+    Cache a parameterless async endpoint's response for a few seconds
+    Frequently polled dashboards then share one computed response
+    
+    Args:
+        seconds (float): How long a computed response stays fresh
+    """
+    def decorator(func):
+        cached = {"expires_at": 0.0, "response": None}
+        
+        @wraps(func)
+        async def wrapper():
+            now = time.monotonic()
+            if now >= cached["expires_at"]:
+                cached["response"] = await func()
+                cached["expires_at"] = now + seconds
+            return cached["response"]
+        
+        return wrapper
+    return decorator
+
+
 # Request/Response Models
 class ShortenRequest(BaseModel):
     url: str
@@ -56,16 +117,16 @@ class ShortenRequest(BaseModel):
     
     @validator('url')
     def validate_url(cls, v):
-        # Basic URL validation
-        url_pattern = re.compile(
-            r'^https?://'  # http:// or https://
-            r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-            r'localhost|'  # localhost...
-            r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-            r'(?::\d+)?'  # optional port
-            r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+        # Basic URL validation: http(s) scheme, a host, valid port, no whitespace
+        try:
+            parts = urlsplit(v)
+            parts.port  # raises ValueError on a malformed port
+        except ValueError:
+            raise ValueError('Invalid URL format')
         
-        if not url_pattern.match(v):
+        if (parts.scheme.lower() not in ('http', 'https')
+                or not parts.hostname
+                or _WHITESPACE_RE.search(v)):
             raise ValueError('Invalid URL format')
         return v
     
@@ -86,6 +147,7 @@ class ShortenRequest(BaseModel):
 
 
 class ShortenResponse(BaseModel):
+    # Built internally from trusted values via model_construct (no re-validation)
     success: bool
     original_url: str
     short_code: str
@@ -100,8 +162,8 @@ class ShortenResponse(BaseModel):
 async def root():
     """Root endpoint with API information"""
     return {
-        "message": "TinyURL - Custom DSA Implementation",
-        "version": "1.0.0",
+        "message": APP_TITLE,
+        "version": APP_VERSION,
         "endpoints": {
             "shorten": "POST /api/shorten",
             "redirect": "GET /{short_code}",
@@ -120,7 +182,8 @@ async def shorten_url(request: ShortenRequest):
     Process Flow:
     1. Validate URL
     2. Check LRU Cache for existing shortened URL
-    3. Check database for existing URL
+    3. Upsert into database (returns existing short code, or a new ID);
+       a custom endpoint always gets its own new row
     4. Generate short code using Base62 encoding OR use custom endpoint
     5. Detect and resolve collisions
     6. Store in all DSA structures
@@ -135,47 +198,49 @@ async def shorten_url(request: ShortenRequest):
         cached_code = lru_cache.get(original_url)
         if cached_code:
             # URL already shortened and in cache
-            return ShortenResponse(
+            return ShortenResponse.model_construct(
                 success=True,
                 original_url=original_url,
                 short_code=cached_code,
-                short_url=f"{API_BASE_URL}/{cached_code}",
+                short_url=API_BASE + cached_code,
                 collision_detected=False,
                 attempts=1,
                 strategy_used=None,
                 cached=True
             )
     
-    # Step 2: Check database for existing URL (skip if custom endpoint is provided)
-    if not custom_endpoint:
-        try:
-            existing_url = await db.get_url_by_original(original_url)
-            if existing_url and existing_url.get('short_code'):
-                short_code = existing_url['short_code']
-                
-                # Add to cache and other structures
-                lru_cache.put(original_url, short_code)
-                hash_map.put(short_code, original_url)
-                trie.insert(original_url)
-                
-                return ShortenResponse(
-                    success=True,
-                    original_url=original_url,
-                    short_code=short_code,
-                    short_url=f"{API_BASE_URL}/{short_code}",
-                    collision_detected=False,
-                    attempts=1,
-                    strategy_used=None,
-                    cached=False
-                )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    
-    # Step 3: Insert into database to get auto-increment ID
+    # Step 2: Insert URL, or get the existing row, in a single round trip
+    # Custom endpoints get a row of their own so links already issued for
+    # this URL keep working
     try:
-        url_id = await db.insert_url(original_url)
+        if custom_endpoint:
+            url_id = await db.insert_url(original_url, is_custom=True)
+            existing_code = None
+        else:
+            row = await db.upsert_url(original_url)
+            url_id = row['id']
+            existing_code = row['short_code']
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to insert URL: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    
+    # Step 3: URL already shortened
+    if existing_code:
+        # Add to cache and other structures
+        lru_cache.put(original_url, existing_code)
+        redirect_cache.put(existing_code, original_url)
+        hash_map.put(existing_code, original_url)
+        trie.insert(original_url)
+        
+        return ShortenResponse.model_construct(
+            success=True,
+            original_url=original_url,
+            short_code=existing_code,
+            short_url=API_BASE + existing_code,
+            collision_detected=False,
+            attempts=1,
+            strategy_used=None,
+            cached=False
+        )
     
     # Step 4: Use custom endpoint or encode ID to Base62 short code
     if custom_endpoint:
@@ -199,28 +264,51 @@ async def shorten_url(request: ShortenRequest):
         except ValueError as e:
             raise HTTPException(status_code=500, detail=str(e))
     
-    # Step 6: Update database with final short code
+    # Step 6 + 7: Update database with final short code while the URL is
+    # indexed for search and the LRU cache (CPU work overlaps the DB round
+    # trip); neither is consulted by redirects
+    async def index_url():
+        lru_cache.put(original_url, short_code)
+        trie.insert(original_url)
+    
+    url_was_indexed = original_url in trie
+    
     try:
-        await db.update_short_code(
-            url_id, 
-            short_code, 
-            collision_resolved=collision_detected,
-            resolution_strategy=strategy_used
+        stored_code, _ = await asyncio.gather(
+            db.update_short_code(
+                url_id, 
+                short_code, 
+                collision_resolved=collision_detected,
+                resolution_strategy=strategy_used
+            ),
+            index_url()
         )
     except Exception as e:
+        # Undo this request's indexing; the code never reached hash_map
+        lru_cache.delete(original_url)
+        if not url_was_indexed:
+            trie.delete(original_url)
         raise HTTPException(status_code=500, detail=f"Failed to update short code: {str(e)}")
     
-    # Step 7: Store in all DSA structures
+    # A concurrent request for the same URL assigned the row's code first
+    # (our "collision" may have been against its code): answer with that one
+    if stored_code != short_code:
+        short_code = stored_code
+        lru_cache.put(original_url, short_code)
+        collision_detected = False
+        attempts = 1
+        strategy_used = None
+    
+    # Redirect lookups only learn the code once the database has accepted it
     hash_map.put(short_code, original_url)
-    lru_cache.put(original_url, short_code)
-    trie.insert(original_url)
+    redirect_cache.put(short_code, original_url)
     
     # Step 8: Return response
-    return ShortenResponse(
+    return ShortenResponse.model_construct(
         success=True,
         original_url=original_url,
         short_code=short_code,
-        short_url=f"{API_BASE_URL}/{short_code}",
+        short_url=API_BASE + short_code,
         collision_detected=collision_detected,
         attempts=attempts,
         strategy_used=strategy_used,
@@ -228,26 +316,56 @@ async def shorten_url(request: ShortenRequest):
     )
 
 
+async def update_analytics(short_code, original_url, url_data=None):
+    """
+    Record a redirect: increment clicks and refresh in-memory rankings
+    Runs as a background task after the redirect response has been sent
+    
+    Args:
+        short_code (str): Short code that was visited
+        original_url (str): URL the short code resolves to
+        url_data (dict): Row already fetched during the redirect, if any
+    """
+    try:
+        # Increment click count
+        new_clicks = await db.increment_clicks(short_code)
+        
+        # Update Trie frequency
+        trie.update_frequency(original_url)
+        
+        # Update Top K URLs
+        # Reuse the row fetched during the redirect (if any) instead of querying again
+        if url_data is None:
+            url_data = {"short_code": short_code, "original_url": original_url}
+        url_data["clicks"] = new_clicks
+        top_k_urls.add_or_update(short_code, new_clicks, url_data)
+        
+    except Exception as e:
+        # Don't fail redirect if analytics update fails
+        print(f"Analytics update error: {str(e)}")
+
+
 @app.get("/{short_code}")
-async def redirect_url(short_code: str):
+async def redirect_url(short_code: str, background_tasks: BackgroundTasks):
     """
     Redirect to original URL
     
     Process:
-    1. Check LRU Cache
+    1. Check redirect LRU Cache
     2. Check HashMap
     3. Query database
-    4. Increment click count
-    5. Update analytics
-    6. Redirect
+    4. Schedule analytics (click count, Trie, Top K) in the background
+    5. Redirect
     """
-    # Step 1: Check LRU Cache (by short_code as key for reverse lookup)
-    # Note: We need to modify our approach - cache stores original_url -> short_code
-    # For redirect, we need short_code -> original_url
+    # Step 1: Check redirect cache (hot short codes stay here)
+    original_url = redirect_cache.get(short_code)
+    if original_url:
+        background_tasks.add_task(update_analytics, short_code, original_url)
+        return RedirectResponse(url=original_url, status_code=301)
     
-    original_url = None
+    url_data = None
     
-    # Step 2: Check HashMap first (fastest)
+    # Step 2: Check HashMap
     original_url = hash_map.get(short_code)
     
     # Step 3: If not in HashMap, query database
@@ -268,27 +386,17 @@ async def redirect_url(short_code: str):
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     
-    # Step 4: Increment click count
-    try:
-        new_clicks = await db.increment_clicks(short_code)
-        
-        # Step 5: Update Trie frequency
-        trie.update_frequency(original_url)
-        
-        # Step 6: Update Top K URLs
-        url_data = await db.get_url_by_short_code(short_code)
-        if url_data:
-            top_k_urls.add_or_update(short_code, new_clicks, url_data)
-        
-    except Exception as e:
-        # Don't fail redirect if analytics update fails
-        print(f"Analytics update error: {str(e)}")
+    redirect_cache.put(short_code, original_url)
+    
+    # Step 4: Update analytics after the response is sent
+    background_tasks.add_task(update_analytics, short_code, original_url, url_data)
     
-    # Step 7: Redirect to original URL
+    # Step 5: Redirect to original URL
     return RedirectResponse(url=original_url, status_code=301)
 
 
 @app.get("/api/stats")
+@ttl_cache(seconds=2)
 async def get_stats():
     """
     Get comprehensive statistics about all DSA structures
@@ -296,12 +404,14 @@ async def get_stats():
     return {
         "hash_map": hash_map.get_stats(),
         "lru_cache": lru_cache.get_stats(),
+        "redirect_cache": redirect_cache.get_stats(),
         "trie": trie.get_stats(),
         "collision_detector": collision_detector.get_collision_stats()
     }
 
 
 @app.get("/api/top")
+@ttl_cache(seconds=2)
 async def get_top_urls():
     """
     Get top K URLs by click count
@@ -342,48 +452,113 @@ async def search_urls(prefix: str, max_results: int = 5):
     }
 
 
-@app.on_event("startup")
-async def startup_event():
+def valid_rows(rows):
     """
-    Initialize application on startup
-    Load existing URLs from database into DSA structures
+    Keep only URL rows that have both a short code and an original URL
+    
+    Args:
+        rows (list): URL rows from the database
+    """
+    return [
+        row for row in rows
+        if row.get('short_code') and row.get('original_url')
+    ]
+
+
+def load_search_structures(rows):
+    """
+    Bulk-load URL rows into Trie and Top K URLs
+    
+    Args:
+        rows (list): Valid URL rows (see valid_rows)
+    """
+    trie.bulk_insert((row['original_url'], row.get('clicks', 0)) for row in rows)
+    top_k_urls.bulk_load((row['short_code'], row.get('clicks', 0), row) for row in rows)
+
+
+async def preload_hash_map(batch_size=1000):
+    """
+    Load every existing short code from the database into the HashMap
+    Runs before the server accepts requests: collision detection only
+    sees codes in the HashMap, so shortens must not run against a partial one
+    
+    Args:
+        batch_size (int): Rows fetched per page
+    
+    Returns:
+        list: The loaded rows, for load_search_structures
     """
-    print("🚀 Starting TinyURL application...")
     print("📊 Loading existing URLs from database...")
     
+    loaded_rows = []
     try:
-        # Load all URLs from database
-        all_urls = await db.get_all_urls()
-        
-        for url_data in all_urls:
-            short_code = url_data.get('short_code')
-            original_url = url_data.get('original_url')
-            clicks = url_data.get('clicks', 0)
+        last_id = 0
+        while True:
+            rows = await db.get_urls_page(after_id=last_id, limit=batch_size)
+            if not rows:
+                break
             
-            if short_code and original_url:
-                # Populate HashMap
-                hash_map.put(short_code, original_url)
-                
-                # Populate Trie
-                trie.insert(original_url, frequency=clicks)
-                
-                # Populate Top K URLs
-                top_k_urls.add_or_update(short_code, clicks, url_data)
+            last_id = rows[-1]['id']
+            rows = valid_rows(rows)
+            hash_map.bulk_put((row['short_code'], row['original_url']) for row in rows)
+            loaded_rows.extend(rows)
         
-        print(f"✅ Loaded {len(all_urls)} URLs into memory")
+        print(f"✅ Loaded {len(loaded_rows)} URLs into memory")
         print(f"📈 HashMap size: {hash_map.size}")
-        print(f"🌳 Trie URLs: {trie.total_urls}")
-        print(f"🔥 Top URLs tracked: {top_k_urls.heap.size}")
         
     except Exception as e:
         print(f"⚠️  Warning: Could not load URLs from database: {str(e)}")
         print("   Application will continue with empty data structures")
+    
+    return loaded_rows
+
+
+async def preload_search_structures(rows, batch_size=1000):
+    """
+    Load already-fetched URL rows into Trie and Top K URLs
+    Works batch by batch and yields to the event loop in between,
+    so the server keeps serving requests while it warms up
+    
+    Args:
+        rows (list): Rows returned by preload_hash_map
+        batch_size (int): Rows loaded per batch
+    """
+    for start in range(0, len(rows), batch_size):
+        load_search_structures(rows[start:start + batch_size])
+        
+        # Let pending requests run between batches
+        await asyncio.sleep(0)
+    
+    print(f"🌳 Trie URLs: {trie.total_urls}")
+    print(f"🔥 Top URLs tracked: {top_k_urls.size}")
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
-    )
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run the TinyURL API server")
+    parser.add_argument("--dev", action="store_true",
+                        help="Single process with auto-reload (development)")
+    # Collision detection runs on the per-process hash_map, so workers
+    # cannot see each other's codes: more than one is unsupported for now
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes in production mode (unsupported above 1)")
+    args = parser.parse_args()
+    
+    if args.dev:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True
+        )
+    else:
+        # uvloop + httptools; each worker would hold its own in-memory DSA structures
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=args.workers
+        )
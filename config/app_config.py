@@ -1,10 +1,51 @@
 import os
+from functools import lru_cache
+from typing import Tuple
+from pydantic import BaseModel, Field
 
-# API Base URL configuration
-# Priority: 1. Environment Variable, 2. Default Render URL
-API_BASE_URL = "https://tinyurl-backend-02o2.onrender.com"
-# API_BASE_URL = "http://localhost:8000"
 
-# Other global configurations can be added here
-APP_TITLE = "TinyURL - Custom DSA Implementation"
-APP_VERSION = "1.0.0"
+def _split_origins(value):
+    """Parse a comma-separated origin list into a tuple"""
+    return tuple(origin.strip() for origin in value.split(",") if origin.strip())
+
+
+class Settings(BaseModel):
+    """
+    Application settings
+    Each field reads its environment variable once, when Settings() is built
+    """
+
+    # API Base URL configuration
+    # Priority: 1. Environment Variable, 2. Default Render URL
+    api_base_url: str = Field(
+        default_factory=lambda: os.getenv(
+            "API_BASE_URL", "https://tinyurl-backend-02o2.onrender.com"
+        )
+    )
+
+    # Frontend origins allowed by CORS (comma-separated CORS_ORIGINS env var)
+    cors_origins: Tuple[str, ...] = Field(
+        default_factory=lambda: _split_origins(
+            os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173")
+        )
+    )
+
+    # Other global configurations can be added here
+    app_title: str = "TinyURL - Custom DSA Implementation"
+    app_version: str = "1.0.0"
+
+
+@lru_cache
+def get_settings():
+    """Build Settings once and reuse it for the lifetime of the process"""
+    return Settings()
+
+
+settings = get_settings()
+
+API_BASE_URL = settings.api_base_url.rstrip("/")
+# Prefix for short URLs: short_url = API_BASE + short_code
+API_BASE = API_BASE_URL + "/"
+CORS_ORIGINS = settings.cors_origins
+APP_TITLE = settings.app_title
+APP_VERSION = settings.app_version
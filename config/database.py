@@ -1,11 +1,11 @@
 """
-Supabase Database Configuration
-Handles connection and operations with PostgreSQL database
+PostgreSQL Database Configuration
+Handles connection pooling and operations against the Supabase Postgres instance
 """
 
 import os
 from pathlib import Path
-from supabase import create_client, Client
+import asyncpg
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -18,7 +18,7 @@ env_path = current_dir.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
 # Print confirmation (for debugging)
-if os.getenv("SUPABASE_URL"):
+if os.getenv("DATABASE_URL"):
     print(f"✅ Environment variables loaded from: {env_path}")
 else:
     print(f"⚠️  Warning: .env file not found at {env_path}")
@@ -26,176 +26,252 @@ else:
 
 class Database:
     """
-    Database connection and operations handler
+    Database connection pool and operations handler
+
+    The pool is created lazily by connect() from the application startup
+    hook, so importing this module never opens a network connection.
     """
-    
-    def __init__(self):
-        """Initialize Supabase client"""
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_KEY")
-        
-        if not supabase_url or not supabase_key:
-            raise ValueError(
-                "SUPABASE_URL and SUPABASE_KEY must be set in environment variables"
-            )
-        
-        self.client: Client = create_client(supabase_url, supabase_key)
-    
-    async def insert_url(self, original_url):
+
+    def __init__(self, dsn=None, min_size=4, max_size=20):
+        """
+        Store connection settings
+
+        Args:
+            dsn (str): Postgres connection string (defaults to DATABASE_URL)
+            min_size (int): Minimum number of pooled connections
+            max_size (int): Maximum number of pooled connections
+        """
+        self.dsn = dsn or os.getenv("DATABASE_URL")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool = None
+
+    async def connect(self):
+        """Create the asyncpg connection pool"""
+        if self.pool is not None:
+            return
+
+        if not self.dsn:
+            raise ValueError("DATABASE_URL must be set in environment variables")
+
+        # asyncpg caches prepared statements per pooled connection, so the
+        # fixed queries below are parsed and planned only once per connection
+        self.pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=self.min_size,
+            max_size=self.max_size
+        )
+
+    async def close(self):
+        """Close all pooled connections"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    async def insert_url(self, original_url, is_custom=False):
         """
         Insert a new URL and get auto-generated ID
-        
+
         Args:
             original_url (str): Original URL to shorten
-            
+            is_custom (bool): Whether the row will hold a custom endpoint
+
         Returns:
             int: Auto-generated ID from database
         """
         try:
-            result = self.client.table("urls").insert({
-                "original_url": original_url,
-                "clicks": 0
-            }).execute()
-            
-            if result.data and len(result.data) > 0:
-                return result.data[0]["id"]
-            else:
+            url_id = await self.pool.fetchval(
+                "INSERT INTO urls (original_url, clicks, is_custom) VALUES ($1, 0, $2) RETURNING id",
+                original_url, is_custom
+            )
+
+            if url_id is None:
                 raise Exception("Failed to insert URL into database")
+            return url_id
         except Exception as e:
             raise Exception(f"Database insert error: {str(e)}")
-    
+
+    async def upsert_url(self, original_url):
+        """
+        Insert a URL, or return its existing auto-generated row
+        One round trip replaces the separate lookup + insert; rows holding
+        custom endpoints never match, so they are never reused here
+
+        Args:
+            original_url (str): Original URL to shorten
+
+        Returns:
+            dict: {"id": int, "short_code": str or None}
+                  short_code is None for a newly inserted URL
+        """
+        try:
+            row = await self.pool.fetchrow(
+                "INSERT INTO urls (original_url, clicks) VALUES ($1, 0) "
+                "ON CONFLICT (original_url) WHERE NOT is_custom "
+                "DO UPDATE SET original_url = EXCLUDED.original_url "
+                "RETURNING id, short_code",
+                original_url
+            )
+
+            if row is None:
+                raise Exception("Failed to upsert URL into database")
+            return dict(row)
+        except Exception as e:
+            raise Exception(f"Database upsert error: {str(e)}")
+
     async def update_short_code(self, url_id, short_code, collision_resolved=False, resolution_strategy=None):
         """
-        Update the short code for a URL
-        
+        Set the short code for a URL, unless the row already has one
+        Two concurrent shortens of the same new URL share one row; only the
+        first to get here assigns its code, the other gets that code back
+
         Args:
             url_id (int): Database ID of the URL
             short_code (str): Generated short code
             collision_resolved (bool): Whether collision was resolved
             resolution_strategy (str): Strategy used for collision resolution
+
+        Returns:
+            str: Short code stored on the row (short_code, or the one already set)
         """
         try:
-            update_data = {
-                "short_code": short_code,
-                "collision_resolved": collision_resolved
-            }
-            
-            if resolution_strategy:
-                update_data["resolution_strategy"] = resolution_strategy
-            
-            self.client.table("urls").update(update_data).eq("id", url_id).execute()
+            stored_code = await self.pool.fetchval(
+                "UPDATE urls SET short_code = $2, collision_resolved = $3, "
+                "resolution_strategy = COALESCE($4, resolution_strategy) "
+                "WHERE id = $1 AND short_code IS NULL "
+                "RETURNING short_code",
+                url_id, short_code, collision_resolved, resolution_strategy
+            )
+            if stored_code is None:
+                stored_code = await self.pool.fetchval(
+                    "SELECT short_code FROM urls WHERE id = $1", url_id
+                )
+            return stored_code
         except Exception as e:
             raise Exception(f"Database update error: {str(e)}")
-    
+
     async def get_url_by_short_code(self, short_code):
         """
         Get URL data by short code
-        
+
         Args:
             short_code (str): Short code to lookup
-            
+
         Returns:
             dict: URL data or None if not found
         """
         try:
-            result = self.client.table("urls").select("*").eq("short_code", short_code).execute()
-            
-            if result.data and len(result.data) > 0:
-                return result.data[0]
-            return None
+            row = await self.pool.fetchrow(
+                "SELECT * FROM urls WHERE short_code = $1", short_code
+            )
+            return dict(row) if row else None
         except Exception as e:
             raise Exception(f"Database query error: {str(e)}")
-    
+
     async def get_url_by_original(self, original_url):
         """
         Check if original URL already exists
-        
+
         Args:
             original_url (str): Original URL to check
-            
+
         Returns:
             dict: URL data or None if not found
         """
         try:
-            result = self.client.table("urls").select("*").eq("original_url", original_url).execute()
-            
-            if result.data and len(result.data) > 0:
-                return result.data[0]
-            return None
+            row = await self.pool.fetchrow(
+                "SELECT * FROM urls WHERE original_url = $1 LIMIT 1", original_url
+            )
+            return dict(row) if row else None
         except Exception as e:
             raise Exception(f"Database query error: {str(e)}")
-    
+
     async def increment_clicks(self, short_code):
         """
         Increment click count for a URL
-        
+
         Args:
             short_code (str): Short code of URL
-            
+
         Returns:
             int: New click count
         """
         try:
-            # Get current clicks
-            result = self.client.table("urls").select("clicks").eq("short_code", short_code).execute()
-            
-            if result.data and len(result.data) > 0:
-                current_clicks = result.data[0]["clicks"]
-                new_clicks = current_clicks + 1
-                
-                # Update clicks
-                self.client.table("urls").update({"clicks": new_clicks}).eq("short_code", short_code).execute()
-                
-                return new_clicks
-            return 0
+            new_clicks = await self.pool.fetchval(
+                "UPDATE urls SET clicks = clicks + 1 WHERE short_code = $1 RETURNING clicks",
+                short_code
+            )
+            return new_clicks if new_clicks is not None else 0
         except Exception as e:
             raise Exception(f"Database update error: {str(e)}")
-    
+
     async def get_top_urls(self, limit=10):
         """
         Get top URLs by click count
-        
+
         Args:
             limit (int): Number of top URLs to retrieve
-            
+
         Returns:
             list: List of URL data sorted by clicks
         """
         try:
-            result = self.client.table("urls").select("*").order("clicks", desc=True).limit(limit).execute()
-            return result.data if result.data else []
+            rows = await self.pool.fetch(
+                "SELECT * FROM urls ORDER BY clicks DESC LIMIT $1", limit
+            )
+            return [dict(row) for row in rows]
         except Exception as e:
             raise Exception(f"Database query error: {str(e)}")
-    
+
     async def get_all_urls(self):
         """
         Get all URLs from database
-        
+
         Returns:
             list: List of all URL data
         """
         try:
-            result = self.client.table("urls").select("*").execute()
-            return result.data if result.data else []
+            rows = await self.pool.fetch("SELECT * FROM urls")
+            return [dict(row) for row in rows]
+        except Exception as e:
+            raise Exception(f"Database query error: {str(e)}")
+
+    async def get_urls_page(self, after_id=0, limit=1000):
+        """
+        Get one page of URLs ordered by ID (keyset pagination)
+
+        Args:
+            after_id (int): Return rows with id greater than this
+            limit (int): Maximum number of rows
+
+        Returns:
+            list: List of URL data, empty when there are no more rows
+        """
+        try:
+            rows = await self.pool.fetch(
+                "SELECT * FROM urls WHERE id > $1 ORDER BY id LIMIT $2",
+                after_id, limit
+            )
+            return [dict(row) for row in rows]
         except Exception as e:
             raise Exception(f"Database query error: {str(e)}")
-    
+
     async def delete_url(self, short_code):
         """
         Delete a URL by short code
-        
+
         Args:
             short_code (str): Short code to delete
-            
+
         Returns:
             bool: True if deleted, False otherwise
         """
         try:
-            self.client.table("urls").delete().eq("short_code", short_code).execute()
+            await self.pool.execute("DELETE FROM urls WHERE short_code = $1", short_code)
             return True
         except Exception as e:
             raise Exception(f"Database delete error: {str(e)}")
 
 
-# Global database instance
+# Global database instance (pool is opened on application startup)
 db = Database()
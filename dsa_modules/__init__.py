@@ -9,6 +9,7 @@ from .lru_cache import LRUCache
 from .trie import Trie
 from .min_heap import MinHeap, TopKURLs
 from .collision_detector import CollisionDetector
+from .sharded import ShardedHashMap, ShardedLRUCache
 
 __all__ = [
     'HashMap',
@@ -17,5 +18,7 @@ __all__ = [
     'Trie',
     'MinHeap',
     'TopKURLs',
-    'CollisionDetector'
+    'CollisionDetector',
+    'ShardedHashMap',
+    'ShardedLRUCache'
 ]
@@ -5,84 +5,161 @@ Used to convert database IDs to short codes
 Time Complexity: O(log₆₂(n)) for both encode and decode
 """
 
+# Character set: digits + lowercase + uppercase = 62 chars
+_CHARSET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_CHARSET_BYTES = _CHARSET.encode('ascii')
+_BASE = 62
+
+# 11 digits cover every 64-bit ID (62^11 > 2^64)
+_MAX_DIGITS = 11
+
+# _POWERS[d] = 62^d, the smallest value needing d + 1 digits
+_POWERS = [_BASE ** d for d in range(2 * _MAX_DIGITS + 1)]
+
+# 256-entry lookup table: byte value -> digit value (_INVALID if not base62)
+_INVALID = 0xFF
+_DECODE_TABLE = bytes(
+    _CHARSET_BYTES.index(b) if b in _CHARSET_BYTES else _INVALID
+    for b in range(256)
+)
+
+# Two-digit tables: value in [0, 62^2) -> high / low charset byte,
+# so the encode loop emits two digits per divmod
+_PAIR_BASE = _BASE * _BASE
+_PAIR_HIGH = bytes(_CHARSET_BYTES[pair // _BASE] for pair in range(_PAIR_BASE))
+_PAIR_LOW = bytes(_CHARSET_BYTES[pair % _BASE] for pair in range(_PAIR_BASE))
+
+
 class Base62Codec:
     """
     Base62 encoder/decoder for converting integers to short strings
     """
-    
-    # Character set: digits + lowercase + uppercase = 62 chars
-    CHARSET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    BASE = 62
-    
-    @classmethod
-    def encode(cls, number):
+
+    # Public aliases of the module-level tables (CHARSET and BASE were
+    # class attributes originally; the rest are used by CollisionDetector)
+    CHARSET = _CHARSET
+    CHARSET_BYTES = _CHARSET_BYTES
+    BASE = _BASE
+    INVALID = _INVALID
+    DECODE_TABLE = _DECODE_TABLE
+
+    @staticmethod
+    def encode(number):
         """
         Encode a positive integer to base62 string
-        
+
         Args:
             number (int): Positive integer to encode
-            
+
         Returns:
             str: Base62 encoded string
-            
+
         Example:
             encode(125) -> "2D"
             encode(1000) -> "g8"
         """
-        if number == 0:
-            return cls.CHARSET[0]
-        
         if number < 0:
             raise ValueError("Cannot encode negative numbers")
-        
-        result = []
-        while number > 0:
-            remainder = number % cls.BASE
-            result.append(cls.CHARSET[remainder])
-            number //= cls.BASE
-        
-        # Reverse because we built it backwards
-        return ''.join(reversed(result))
-    
-    @classmethod
-    def decode(cls, encoded_string):
+
+        # Single digit: no buffer needed
+        if number < _BASE:
+            return _CHARSET[number]
+
+        # Exact digit count from bit_length (see digit_count), inlined
+        size = ((number.bit_length() - 1) * 1000) // 5955 + 1
+        if size < len(_POWERS):
+            if number >= _POWERS[size]:
+                size += 1
+        else:
+            size = Base62Codec.digit_count(number)
+        buf = bytearray(size)
+
+        # Fill right-to-left two digits at a time so no reversal is needed
+        idx = size
+        while idx > 1:
+            number, pair = divmod(number, _PAIR_BASE)
+            idx -= 2
+            buf[idx] = _PAIR_HIGH[pair]
+            buf[idx + 1] = _PAIR_LOW[pair]
+
+        # Odd digit count leaves one leading digit
+        if idx:
+            buf[0] = _CHARSET_BYTES[number]
+
+        return buf.decode('ascii')
+
+    @staticmethod
+    def digit_count(number):
+        """
+        Count base62 digits of a non-negative integer without dividing
+
+        Args:
+            number (int): Non-negative integer
+
+        Returns:
+            int: Number of base62 digits (1 for zero)
+
+        Example:
+            digit_count(61) -> 1
+            digit_count(62) -> 2
+        """
+        # log2(62) ~= 5.954, so this never overestimates the digit count
+        digits = (max(number.bit_length() - 1, 0) * 1000) // 5955 + 1
+
+        while number >= (_POWERS[digits] if digits < len(_POWERS) else _BASE ** digits):
+            digits += 1
+
+        return digits
+
+    @staticmethod
+    def decode(encoded_string):
         """
         Decode a base62 string to integer
-        
+
         Args:
             encoded_string (str): Base62 encoded string
-            
+
         Returns:
             int: Decoded integer
-            
+
         Example:
             decode("2D") -> 125
             decode("g8") -> 1000
         """
         if not encoded_string:
             raise ValueError("Cannot decode empty string")
-        
+
+        try:
+            data = encoded_string.encode('ascii')
+        except UnicodeEncodeError as e:
+            bad_char = encoded_string[e.start]
+            raise ValueError(f"Invalid character '{bad_char}' in base62 string")
+
+        # Map every character to its digit value in one C-level pass,
+        # so the loop below is pure integer arithmetic
+        digits = data.translate(_DECODE_TABLE)
+        if _INVALID in digits:
+            bad_char = encoded_string[digits.index(_INVALID)]
+            raise ValueError(f"Invalid character '{bad_char}' in base62 string")
+
         result = 0
-        for char in encoded_string:
-            if char not in cls.CHARSET:
-                raise ValueError(f"Invalid character '{char}' in base62 string")
-            
-            result = result * cls.BASE + cls.CHARSET.index(char)
-        
+        for digit in digits:
+            result = result * _BASE + digit
+
         return result
-    
-    @classmethod
-    def validate(cls, encoded_string):
+
+    @staticmethod
+    def validate(encoded_string):
         """
         Validate if a string is a valid base62 encoded string
-        
+
         Args:
             encoded_string (str): String to validate
-            
+
         Returns:
             bool: True if valid, False otherwise
         """
-        if not encoded_string:
+        if not encoded_string or not encoded_string.isascii():
             return False
-        
-        return all(char in cls.CHARSET for char in encoded_string)
+
+        return _INVALID not in encoded_string.encode('ascii').translate(_DECODE_TABLE)
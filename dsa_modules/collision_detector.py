@@ -3,11 +3,19 @@ Collision Detection and Resolution Module
 Detects when short codes collide and provides multiple resolution strategies
 """
 
-import random
-import string
-import time
+import os
+from collections import deque
 from .base62_codec import Base62Codec
 
+# Random byte -> base62 character; bytes >= 248 are dropped so every
+# character is equally likely (248 is the largest multiple of 62 in a byte)
+_RANDOM_BYTE_LIMIT = 248
+_RANDOM_CHAR_TABLE = bytes(
+    Base62Codec.CHARSET_BYTES[byte % 62] if byte < _RANDOM_BYTE_LIMIT else 0
+    for byte in range(256)
+)
+_RANDOM_REJECTED = bytes(range(_RANDOM_BYTE_LIMIT, 256))
+
 
 class CollisionDetector:
     """
@@ -15,14 +23,19 @@ class CollisionDetector:
     Implements 3 strategies: Linear Probing, Regeneration, Append Counter
     """
     
-    def __init__(self, hash_map):
+    def __init__(self, hash_map, code_length=7, code_batch_size=256):
         """
         Initialize collision detector
         
         Args:
             hash_map: HashMap instance to check for collisions
+            code_length (int): Length of codes made by the 'regenerate' strategy
+            code_batch_size (int): Random codes generated per refill of the pool
         """
         self.hash_map = hash_map
+        self.code_length = code_length
+        self.code_batch_size = code_batch_size
+        self._free_codes = deque()  # pre-generated random codes for 'regenerate'
         self.collision_stats = {
             "total_collisions": 0,
             "linear_probing_used": 0,
@@ -30,6 +43,8 @@ class CollisionDetector:
             "append_counter_used": 0,
             "max_attempts": 0
         }
+        # short_code -> next counter to try with the 'append' strategy
+        self._append_next = {}
     
     def detect_collision(self, short_code):
         """
@@ -41,7 +56,7 @@ class CollisionDetector:
         Returns:
             bool: True if collision detected, False otherwise
         """
-        return self.hash_map.contains(short_code)
+        return short_code in self.hash_map
     
     def resolve_collision(self, short_code, strategy='linear', max_attempts=10):
         """
@@ -61,11 +76,25 @@ class CollisionDetector:
         attempts = 0
         new_code = short_code
         
+        # Linear probing offsets the same base number on every attempt,
+        # so decode the original code once instead of once per attempt
+        base_number = None
+        if strategy == 'linear':
+            try:
+                base_number = Base62Codec.decode(short_code)
+            except ValueError:
+                base_number = None
+        
         while attempts < max_attempts:
             attempts += 1
             
             if strategy == 'linear':
-                new_code = self._linear_probing(short_code, attempts)
+                # Pure integer step from the decoded base; codes that are not
+                # valid base62 fall back to character-wise increment
+                if base_number is not None:
+                    new_code = Base62Codec.encode(base_number + attempts)
+                else:
+                    new_code = self._increment_string(short_code, attempts)
                 strategy_used = 'linear_probing'
             elif strategy == 'regenerate':
                 new_code = self._regenerate_code()
@@ -92,27 +121,6 @@ class CollisionDetector:
             f"Unable to resolve collision for '{short_code}' after {max_attempts} attempts"
         )
     
-    def _linear_probing(self, short_code, attempt):
-        """
-        Linear probing: Increment the code sequentially
-        Example: abc -> abd -> abe -> abf
-        
-        Args:
-            short_code (str): Original short code
-            attempt (int): Current attempt number
-            
-        Returns:
-            str: New short code
-        """
-        # Decode to number, add attempt, encode back
-        try:
-            number = Base62Codec.decode(short_code)
-            new_number = number + attempt
-            return Base62Codec.encode(new_number)
-        except:
-            # If decode fails, use simple character increment
-            return self._increment_string(short_code, attempt)
-    
     def _increment_string(self, s, increment):
         """
         Increment a string by treating it as a base-62 number
@@ -124,62 +132,88 @@ class CollisionDetector:
         Returns:
             str: Incremented string
         """
-        charset = Base62Codec.CHARSET
-        result = list(s)
+        # Work on the encoded bytes: iterating bytes yields ints, so digits
+        # come straight from the 256-entry decode table with no ord() or dict
+        charset_bytes = Base62Codec.CHARSET_BYTES
+        decode_table = Base62Codec.DECODE_TABLE
+        invalid = Base62Codec.INVALID
+        base = Base62Codec.BASE
+        result = bytearray(s.encode('utf-8'))
         carry = increment
         
         for i in range(len(result) - 1, -1, -1):
             if carry == 0:
                 break
             
-            current_idx = charset.index(result[i])
-            new_idx = (current_idx + carry) % len(charset)
-            carry = (current_idx + carry) // len(charset)
-            result[i] = charset[new_idx]
+            digit = decode_table[result[i]]
+            if digit == invalid:
+                # Everything right of this byte was base62 (ASCII), so it
+                # belongs to the character at the same distance from the end
+                bad_char = s[len(s) - len(result) + i]
+                raise ValueError(f"Invalid character '{bad_char}' in base62 string")
+            
+            carry, new_idx = divmod(digit + carry, base)
+            result[i] = charset_bytes[new_idx]
         
-        # If still have carry, prepend new character
+        # If still have carry, build the new leading characters in one go
+        prefix = bytearray()
         while carry > 0:
-            result.insert(0, charset[carry % len(charset)])
-            carry //= len(charset)
+            carry, digit = divmod(carry, base)
+            prefix.append(charset_bytes[digit])
+        if prefix:
+            prefix.reverse()
+            result = prefix + result
+        
+        return result.decode('utf-8')
+    
+    def _refill_free_codes(self):
+        """
+        Generate a batch of random codes from a single os.urandom call
+        Bytes are mapped and filtered with one translate, so no per-character
+        Python work is done
+        """
+        length = self.code_length
+        needed = length * self.code_batch_size
+        chars = b""
+        while len(chars) < needed:
+            chars += os.urandom(needed).translate(_RANDOM_CHAR_TABLE, _RANDOM_REJECTED)
         
-        return ''.join(result)
+        chars = chars[:needed].decode('ascii')
+        self._free_codes.extend(chars[i:i + length] for i in range(0, needed, length))
     
     def _regenerate_code(self):
         """
         Regenerate a completely new random code
-        Uses timestamp and random characters for uniqueness
+        Uses OS randomness, so codes are neither predictable nor clustered
+        Codes come from a pre-generated pool that is refilled in batches;
+        the caller still checks each one against the hash map
         
         Returns:
             str: New random short code
         """
-        # Use timestamp for uniqueness
-        timestamp = int(time.time() * 1000000)  # Microseconds
-        
-        # Encode timestamp and add random suffix
-        base_code = Base62Codec.encode(timestamp)
-        
-        # Take last 4-6 characters and add random char
-        code_length = random.randint(4, 6)
-        if len(base_code) > code_length:
-            base_code = base_code[-code_length:]
-        
-        # Add random character for extra uniqueness
-        random_char = random.choice(Base62Codec.CHARSET)
-        return base_code + random_char
+        if not self._free_codes:
+            self._refill_free_codes()
+        return self._free_codes.popleft()
     
     def _append_counter(self, short_code, attempt):
         """
         Append counter to original code
         Example: abc -> abc1 -> abc2 -> abc3
         
+        Counters already handed out for a code are remembered, so a code that
+        keeps colliding resumes after its last counter instead of re-trying
+        every suffix from 1
+        
         Args:
             short_code (str): Original short code
-            attempt (int): Current attempt number
+            attempt (int): Current attempt number (kept for compatibility, unused)
             
         Returns:
             str: Short code with appended counter
         """
-        return f"{short_code}{attempt}"
+        counter = self._append_next.get(short_code, 1)
+        self._append_next[short_code] = counter + 1
+        return f"{short_code}{counter}"
     
     def get_collision_stats(self):
         """
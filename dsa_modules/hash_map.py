@@ -1,169 +1,255 @@
 """
 Custom Hash Map Implementation with Collision Handling
-Uses separate chaining (linked list) for collision resolution
-Dynamic resizing when load factor exceeds 0.75
+Uses open addressing (linear probing) over flat key/value arrays
+Capacity is kept at a power of two so slots are found with a bitmask
+Dynamic resizing when load factor (tombstones included) exceeds 0.5
 """
 
-class HashNode:
-    """Node for separate chaining in hash map"""
-    def __init__(self, key, value):
-        self.key = key
-        self.value = value
-        self.next = None
+# Slot markers: never-used slot, and slot whose entry was deleted
+_EMPTY = object()
+_TOMBSTONE = object()
 
 
 class HashMap:
     """
-    Custom Hash Map with polynomial rolling hash function
+    Custom Hash Map with open addressing (linear probing)
+    Collisions probe forward to the next free slot in the same flat array,
+    so lookups scan contiguous memory instead of chasing linked-list nodes
+
     Time Complexity: O(1) average case for all operations
     Space Complexity: O(n) where n is number of entries
     """
-    
+
     def __init__(self, initial_capacity=16):
-        self.capacity = initial_capacity
+        # Round up to a power of two so hash & mask replaces hash % capacity
+        self.capacity = 1 << max(0, initial_capacity - 1).bit_length()
+        self._mask = self.capacity - 1
         self.size = 0
-        self.buckets = [None] * self.capacity
+        self.tombstones = 0
+        self.keys = [_EMPTY] * self.capacity
+        self.values = [None] * self.capacity
         self.collision_count = 0
-        self.LOAD_FACTOR_THRESHOLD = 0.75
-        
+        # Running probe statistics, kept up to date by put/delete/_resize
+        self.total_probe_length = 0
+        self.max_probe_length = 0
+        # Linear probing degrades quickly past half full, so resize early
+        self.LOAD_FACTOR_THRESHOLD = 0.5
+        # Used slots (live + tombstones) allowed before the next resize
+        self._grow_at = int(self.capacity * self.LOAD_FACTOR_THRESHOLD)
+
     def _hash(self, key):
         """
-        Polynomial rolling hash function
-        Uses prime number 31 for better distribution
+        Map a key to its home slot using Python's builtin hash (SipHash for str)
+        The old per-character polynomial hash put similar keys such as "abc1",
+        "abc2" in adjacent slots, which builds long runs under linear probing
+
+        str caches its hash on the object after the first call, so the shard
+        router, this table and the LRU caches all reuse one SipHash per key
+        object; no per-length specialisation of the hash is needed
+
+        High bits are folded into the low ones before masking: ShardedHashMap
+        routes on the low bits of the same hash, so every key in one shard
+        would otherwise share them and land on a fraction of the slots
         """
-        hash_value = 0
-        prime = 31
-        for char in str(key):
-            hash_value = (hash_value * prime + ord(char)) % self.capacity
-        return hash_value
-    
-    def _resize(self):
+        h = hash(key)
+        return (h ^ (h >> 16)) & self._mask
+
+    def _resize(self, new_capacity=None):
         """
-        Double the capacity and rehash all entries
-        Called when load factor > 0.75
+        Double the capacity (or grow to new_capacity, a power of two) and rehash all entries
+        Called when load factor > 0.5; also drops accumulated tombstones
+        When tombstones outnumber live entries, the table is rehashed at the
+        same capacity instead of doubling
         """
-        old_buckets = self.buckets
-        self.capacity *= 2
-        self.buckets = [None] * self.capacity
-        self.size = 0
-        
-        # Rehash all existing entries
-        for bucket in old_buckets:
-            current = bucket
-            while current:
-                self.put(current.key, current.value)
-                current = current.next
-    
+        old_keys = self.keys
+        old_values = self.values
+        if new_capacity is None:
+            new_capacity = self.capacity if self.tombstones > self.size else self.capacity * 2
+        self.capacity = new_capacity
+        self._mask = self.capacity - 1
+        self._grow_at = int(self.capacity * self.LOAD_FACTOR_THRESHOLD)
+        self.keys = [_EMPTY] * self.capacity
+        self.values = [None] * self.capacity
+        self.tombstones = 0
+
+        # Rehash all live entries (all keys are distinct, so just find a free slot)
+        keys = self.keys
+        values = self.values
+        mask = self._mask
+        total_probe_length = 0
+        max_probe_length = 0
+        for key, value in zip(old_keys, old_values):
+            if key is _EMPTY or key is _TOMBSTONE:
+                continue
+            home = index = self._hash(key)
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            keys[index] = key
+            values[index] = value
+
+            probe_length = (index - home) & mask
+            total_probe_length += probe_length
+            if probe_length > max_probe_length:
+                max_probe_length = probe_length
+
+        self.total_probe_length = total_probe_length
+        self.max_probe_length = max_probe_length
+
     def put(self, key, value):
         """
         Insert or update key-value pair
         Returns: True if new entry, False if updated existing
         """
-        # Check load factor and resize if needed
-        if self.size / self.capacity > self.LOAD_FACTOR_THRESHOLD:
+        # Check load factor including this insert (tombstones occupy slots too)
+        # so at least one slot always stays empty and every probe terminates
+        if self.size + self.tombstones >= self._grow_at:
             self._resize()
-        
-        index = self._hash(key)
-        
-        # If bucket is empty, create new node
-        if self.buckets[index] is None:
-            self.buckets[index] = HashNode(key, value)
-            self.size += 1
-            return True
-        
-        # Traverse the chain to find key or end
-        current = self.buckets[index]
-        prev = None
-        
-        while current:
-            if current.key == key:
+
+        # Hash and probe are inlined (same as _hash) to skip a method call
+        keys = self.keys
+        mask = self._mask
+        h = hash(key)
+        index = home = (h ^ (h >> 16)) & mask
+        free = -1
+
+        # Probe until the key or a never-used slot is found,
+        # remembering the first tombstone passed on the way
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                break
+            if slot_key is _TOMBSTONE:
+                if free < 0:
+                    free = index
+            elif slot_key == key:
                 # Update existing key
-                current.value = value
+                self.values[index] = value
                 return False
-            prev = current
-            current = current.next
-        
-        # Key not found, add to end of chain (collision)
-        prev.next = HashNode(key, value)
+            index = (index + 1) & mask
+
+        # Key not found, reuse the first tombstone or claim the empty slot
+        if free >= 0:
+            index = free
+            self.tombstones -= 1
+        keys[index] = key
+        self.values[index] = value
         self.size += 1
-        self.collision_count += 1
+        if index != home:
+            self.collision_count += 1
+            probe_length = (index - home) & mask
+            self.total_probe_length += probe_length
+            if probe_length > self.max_probe_length:
+                self.max_probe_length = probe_length
         return True
-    
+
+    def bulk_put(self, pairs):
+        """
+        Insert many key-value pairs at once
+        Grows the table a single time up front so no intermediate rehash happens
+
+        Args:
+            pairs (iterable): (key, value) tuples
+        """
+        pairs = list(pairs)
+
+        new_capacity = self.capacity
+        while (self.size + self.tombstones + len(pairs)) / new_capacity > self.LOAD_FACTOR_THRESHOLD:
+            new_capacity *= 2
+        if new_capacity != self.capacity:
+            self._resize(new_capacity)
+
+        for key, value in pairs:
+            self.put(key, value)
+
     def get(self, key):
         """
         Retrieve value by key
         Returns: value if found, None otherwise
         """
-        index = self._hash(key)
-        current = self.buckets[index]
-        
-        while current:
-            if current.key == key:
-                return current.value
-            current = current.next
-        
-        return None
-    
+        keys = self.keys
+        mask = self._mask
+        h = hash(key)
+        index = (h ^ (h >> 16)) & mask
+
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return None
+            if slot_key is not _TOMBSTONE and slot_key == key:
+                return self.values[index]
+            index = (index + 1) & mask
+
     def contains(self, key):
         """
         Check if key exists in hash map
+        Probes like get but never touches the values list
         Returns: True if key exists, False otherwise
         """
-        return self.get(key) is not None
-    
+        keys = self.keys
+        mask = self._mask
+        h = hash(key)
+        index = (h ^ (h >> 16)) & mask
+
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return False
+            if slot_key is not _TOMBSTONE and slot_key == key:
+                return True
+            index = (index + 1) & mask
+
+    __contains__ = contains
+
     def delete(self, key):
         """
         Remove key-value pair
+        Leaves a tombstone so probe sequences through this slot stay intact
         Returns: True if deleted, False if key not found
         """
-        index = self._hash(key)
-        current = self.buckets[index]
-        prev = None
-        
-        while current:
-            if current.key == key:
-                if prev is None:
-                    # Deleting first node in chain
-                    self.buckets[index] = current.next
-                else:
-                    prev.next = current.next
-                self.size -= 1
-                return True
-            prev = current
-            current = current.next
-        
-        return False
-    
+        keys = self.keys
+        mask = self._mask
+        h = hash(key)
+        index = home = (h ^ (h >> 16)) & mask
+
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return False
+            if slot_key is not _TOMBSTONE and slot_key == key:
+                break
+            index = (index + 1) & mask
+
+        self.total_probe_length -= (index - home) & mask
+        keys[index] = _TOMBSTONE
+        self.values[index] = None
+        self.size -= 1
+        self.tombstones += 1
+        return True
+
     def get_stats(self):
         """
         Get statistics about the hash map
+        Probe length = distance from an entry's home slot to where it lives;
+        the max is a high-water mark since the last resize
         """
-        # Calculate chain lengths
-        chain_lengths = []
-        for bucket in self.buckets:
-            length = 0
-            current = bucket
-            while current:
-                length += 1
-                current = current.next
-            if length > 0:
-                chain_lengths.append(length)
-        
-        avg_chain_length = sum(chain_lengths) / len(chain_lengths) if chain_lengths else 0
-        max_chain_length = max(chain_lengths) if chain_lengths else 0
-        
+        avg_probe_length = self.total_probe_length / self.size if self.size else 0
+
         return {
             "size": self.size,
             "capacity": self.capacity,
             "load_factor": self.size / self.capacity,
             "collision_count": self.collision_count,
-            "avg_chain_length": round(avg_chain_length, 2),
-            "max_chain_length": max_chain_length,
-            "non_empty_buckets": len(chain_lengths)
+            "avg_probe_length": round(avg_probe_length, 2),
+            "max_probe_length": self.max_probe_length,
+            "tombstones": self.tombstones
         }
-    
+
     def clear(self):
         """Clear all entries from hash map"""
-        self.buckets = [None] * self.capacity
+        self.keys = [_EMPTY] * self.capacity
+        self.values = [None] * self.capacity
         self.size = 0
+        self.tombstones = 0
         self.collision_count = 0
+        self.total_probe_length = 0
+        self.max_probe_length = 0
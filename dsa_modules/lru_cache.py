@@ -1,22 +1,17 @@
 """
 LRU (Least Recently Used) Cache Implementation
-Uses Doubly Linked List + Hash Map for O(1) operations
+Uses collections.OrderedDict (hash map + doubly linked list in C) for O(1) operations
 Fixed capacity with automatic eviction of least recently used items
 """
 
-class DLLNode:
-    """Doubly Linked List Node"""
-    def __init__(self, key, value):
-        self.key = key
-        self.value = value
-        self.prev = None
-        self.next = None
+from collections import OrderedDict
 
 
 class LRUCache:
     """
     LRU Cache with O(1) get and put operations
-    Uses doubly linked list for ordering and hash map for fast lookup
+    Entries are kept in recency order: least recently used first,
+    most recently used last
     
     Time Complexity: O(1) for get and put
     Space Complexity: O(capacity)
@@ -30,44 +25,17 @@ class LRUCache:
             capacity (int): Maximum number of items to cache
         """
         self.capacity = capacity
-        self.cache = {}  # key -> DLLNode
-        self.size = 0
-        
-        # Dummy head and tail for easier manipulation
-        self.head = DLLNode(0, 0)
-        self.tail = DLLNode(0, 0)
-        self.head.next = self.tail
-        self.tail.prev = self.head
+        self.cache = OrderedDict()  # key -> value, LRU first
         
         # Statistics
         self.hits = 0
         self.misses = 0
         self.evictions = 0
     
-    def _add_to_front(self, node):
-        """Add node right after head (most recently used position)"""
-        node.prev = self.head
-        node.next = self.head.next
-        self.head.next.prev = node
-        self.head.next = node
-    
-    def _remove_node(self, node):
-        """Remove node from its current position"""
-        prev_node = node.prev
-        next_node = node.next
-        prev_node.next = next_node
-        next_node.prev = prev_node
-    
-    def _move_to_front(self, node):
-        """Move existing node to front (mark as recently used)"""
-        self._remove_node(node)
-        self._add_to_front(node)
-    
-    def _remove_lru(self):
-        """Remove least recently used item (node before tail)"""
-        lru_node = self.tail.prev
-        self._remove_node(lru_node)
-        return lru_node
+    @property
+    def size(self):
+        """Number of items currently cached"""
+        return len(self.cache)
     
     def get(self, key):
         """
@@ -79,14 +47,16 @@ class LRUCache:
         Returns:
             Value if found, None otherwise
         """
-        if key in self.cache:
-            node = self.cache[key]
-            self._move_to_front(node)
-            self.hits += 1
-            return node.value
+        cache = self.cache
+        try:
+            # Reorders and checks membership in one lookup
+            cache.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return None
         
-        self.misses += 1
-        return None
+        self.hits += 1
+        return cache[key]
     
     def put(self, key, value):
         """
@@ -97,24 +67,15 @@ class LRUCache:
             key: Key to store
             value: Value to store
         """
-        # If key exists, update value and move to front
-        if key in self.cache:
-            node = self.cache[key]
-            node.value = value
-            self._move_to_front(node)
-            return
+        cache = self.cache
         
-        # Create new node
-        new_node = DLLNode(key, value)
-        self.cache[key] = new_node
-        self._add_to_front(new_node)
-        self.size += 1
+        # Store and mark as most recent (new keys are already last)
+        cache[key] = value
+        cache.move_to_end(key)
         
         # Check capacity and evict if needed
-        if self.size > self.capacity:
-            lru_node = self._remove_lru()
-            del self.cache[lru_node.key]
-            self.size -= 1
+        if len(cache) > self.capacity:
+            cache.popitem(last=False)
             self.evictions += 1
     
     def contains(self, key):
@@ -140,19 +101,13 @@ class LRUCache:
             bool: True if deleted, False if key not found
         """
         if key in self.cache:
-            node = self.cache[key]
-            self._remove_node(node)
             del self.cache[key]
-            self.size -= 1
             return True
         return False
     
     def clear(self):
         """Clear all items from cache"""
         self.cache.clear()
-        self.size = 0
-        self.head.next = self.tail
-        self.tail.prev = self.head
     
     def get_stats(self):
         """
@@ -181,9 +136,4 @@ class LRUCache:
         Returns:
             list: List of keys in order of recency
         """
-        keys = []
-        current = self.head.next
-        while current != self.tail:
-            keys.append(current.key)
-            current = current.next
-        return keys
+        return list(reversed(self.cache))
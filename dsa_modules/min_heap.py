@@ -4,9 +4,24 @@ Array-based binary heap for tracking top K URLs by click count
 Used for analytics and finding most popular URLs
 """
 
+import heapq
+from operator import itemgetter
+
+# Heap keys pack (clicks, sequence) into one int: clicks in the high bits,
+# an insertion sequence number in the low _SEQUENCE_BITS bits
+_SEQUENCE_BITS = 48
+_SEQUENCE_LIMIT = 1 << _SEQUENCE_BITS
+
+
 class MinHeap:
     """
     Min Heap implementation using array-based binary tree
+    Sift up/down is done by the heapq module (C implementation)
+
+    Priorities and payloads are stored apart: the heap array holds plain ints
+    (clicks << 48 | sequence) and url_data lives in a dict keyed by that int.
+    heapq then compares native ints instead of tuples, and equal click counts
+    are ordered by insertion without ever comparing url_data dicts
     
     Time Complexity:
         - Insert: O(log n)
@@ -16,62 +31,26 @@ class MinHeap:
     """
     
     def __init__(self):
-        self.heap = []
-        self.size = 0
-    
-    def _parent(self, index):
-        """Get parent index"""
-        return (index - 1) // 2
-    
-    def _left_child(self, index):
-        """Get left child index"""
-        return 2 * index + 1
-    
-    def _right_child(self, index):
-        """Get right child index"""
-        return 2 * index + 2
-    
-    def _swap(self, i, j):
-        """Swap two elements in heap"""
-        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
-    
-    def _heapify_up(self, index):
-        """
-        Move element up to maintain heap property
-        Called after insertion
-        """
-        while index > 0:
-            parent_idx = self._parent(index)
-            
-            # Compare based on clicks (first element of tuple)
-            if self.heap[index][0] < self.heap[parent_idx][0]:
-                self._swap(index, parent_idx)
-                index = parent_idx
-            else:
-                break
-    
-    def _heapify_down(self, index):
-        """
-        Move element down to maintain heap property
-        Called after extraction
-        """
-        while True:
-            smallest = index
-            left = self._left_child(index)
-            right = self._right_child(index)
-            
-            # Find smallest among node and its children
-            if left < self.size and self.heap[left][0] < self.heap[smallest][0]:
-                smallest = left
-            
-            if right < self.size and self.heap[right][0] < self.heap[smallest][0]:
-                smallest = right
-            
-            if smallest != index:
-                self._swap(index, smallest)
-                index = smallest
-            else:
-                break
+        self.heap = []  # packed keys
+        self.payloads = {}  # packed key -> url_data
+        self._sequence = 0
+    
+    @property
+    def size(self):
+        """Number of elements in heap"""
+        return len(self.heap)
+    
+    def _renumber(self):
+        """Reassign sequence numbers 0..n-1 in heap order once they run out"""
+        ordered = sorted(self.heap)
+        self.heap = [
+            ((key >> _SEQUENCE_BITS) << _SEQUENCE_BITS) | sequence
+            for sequence, key in enumerate(ordered)
+        ]
+        self.payloads = {
+            new_key: self.payloads[old_key] for new_key, old_key in zip(self.heap, ordered)
+        }
+        self._sequence = len(self.heap)
     
     def insert(self, clicks, url_data):
         """
@@ -81,9 +60,13 @@ class MinHeap:
             clicks (int): Number of clicks (priority)
             url_data (dict): URL data including short_code, original_url, etc.
         """
-        self.heap.append((clicks, url_data))
-        self.size += 1
-        self._heapify_up(self.size - 1)
+        if self._sequence >= _SEQUENCE_LIMIT:
+            self._renumber()
+        
+        key = (clicks << _SEQUENCE_BITS) | self._sequence
+        self._sequence += 1
+        heapq.heappush(self.heap, key)
+        self.payloads[key] = url_data
     
     def extract_min(self):
         """
@@ -92,22 +75,37 @@ class MinHeap:
         Returns:
             tuple: (clicks, url_data) or None if heap is empty
         """
-        if self.size == 0:
+        if not self.heap:
             return None
         
-        if self.size == 1:
-            self.size = 0
-            return self.heap.pop()
+        key = heapq.heappop(self.heap)
+        return key >> _SEQUENCE_BITS, self.payloads.pop(key)
+    
+    def replace_min(self, clicks, url_data):
+        """
+        Remove the minimum element and insert a new one in a single sift
+        The backing list keeps its length, so a full top-K heap never
+        shrinks and regrows on each replacement
+        
+        Args:
+            clicks (int): Number of clicks (priority)
+            url_data (dict): URL data including short_code, original_url, etc.
         
-        # Store min element
-        min_element = self.heap[0]
+        Returns:
+            tuple: Removed (clicks, url_data), or None if heap was empty
+        """
+        if not self.heap:
+            self.insert(clicks, url_data)
+            return None
         
-        # Move last element to root and heapify down
-        self.heap[0] = self.heap.pop()
-        self.size -= 1
-        self._heapify_down(0)
+        if self._sequence >= _SEQUENCE_LIMIT:
+            self._renumber()
         
-        return min_element
+        key = (clicks << _SEQUENCE_BITS) | self._sequence
+        self._sequence += 1
+        removed = heapq.heapreplace(self.heap, key)
+        self.payloads[key] = url_data
+        return removed >> _SEQUENCE_BITS, self.payloads.pop(removed)
     
     def get_min(self):
         """
@@ -116,11 +114,15 @@ class MinHeap:
         Returns:
             tuple: (clicks, url_data) or None if heap is empty
         """
-        return self.heap[0] if self.size > 0 else None
+        if not self.heap:
+            return None
+        
+        key = self.heap[0]
+        return key >> _SEQUENCE_BITS, self.payloads[key]
     
     def is_empty(self):
         """Check if heap is empty"""
-        return self.size == 0
+        return not self.heap
     
     def get_all_sorted(self):
         """
@@ -129,27 +131,25 @@ class MinHeap:
         Returns:
             list: List of (clicks, url_data) tuples sorted by clicks
         """
-        # Create a copy and extract all elements
-        temp_heap = MinHeap()
-        temp_heap.heap = self.heap.copy()
-        temp_heap.size = self.size
-        
-        sorted_elements = []
-        while not temp_heap.is_empty():
-            sorted_elements.append(temp_heap.extract_min())
-        
-        return sorted_elements
+        # One sort of the backing int list instead of n extract_min calls
+        payloads = self.payloads
+        return [(key >> _SEQUENCE_BITS, payloads[key]) for key in sorted(self.heap)]
     
     def clear(self):
         """Clear all elements from heap"""
         self.heap = []
-        self.size = 0
+        self.payloads = {}
+        self._sequence = 0
 
 
 class TopKURLs:
     """
     Track top K URLs by click count using Min Heap
     Maintains a fixed-size heap of K most clicked URLs
+
+    Updates use lazy deletion: the old heap entry is left in place and
+    becomes stale once clicks_by_code holds a different count for its
+    short code, then is skipped when it reaches the top of the heap
     """
     
     def __init__(self, k=10):
@@ -160,8 +160,34 @@ class TopKURLs:
             k (int): Number of top URLs to track
         """
         self.k = k
-        self.heap = MinHeap()
-        self.url_map = {}  # short_code -> (clicks, url_data) for quick lookup
+        self.heap = MinHeap()  # (clicks, (short_code, url_data)), possibly stale
+        self.clicks_by_code = {}  # short_code -> current clicks of tracked URLs
+    
+    @property
+    def size(self):
+        """Number of URLs currently tracked"""
+        return len(self.clicks_by_code)
+    
+    def _push(self, short_code, clicks, url_data):
+        """Record clicks as the current count for short_code and add its heap entry"""
+        self.clicks_by_code[short_code] = clicks
+        self.heap.insert(clicks, (short_code, url_data))
+    
+    def _live_min(self):
+        """
+        Pop stale entries off the top of the heap and return the live minimum
+        
+        Returns:
+            tuple: (clicks, short_code) of the least clicked tracked URL, or None
+        """
+        heap = self.heap
+        clicks_by_code = self.clicks_by_code
+        while not heap.is_empty():
+            clicks, (short_code, _) = heap.get_min()
+            if clicks_by_code.get(short_code) == clicks:
+                return clicks, short_code
+            heap.extract_min()
+        return None
     
     def add_or_update(self, short_code, clicks, url_data):
         """
@@ -172,36 +198,72 @@ class TopKURLs:
             clicks (int): Current click count
             url_data (dict): URL data
         """
-        # If URL already in tracker, we need to rebuild heap
-        if short_code in self.url_map:
-            # Remove old entry and rebuild
-            del self.url_map[short_code]
-            self._rebuild_heap()
+        current = self.clicks_by_code.get(short_code)
+        
+        # If URL already tracked, push the higher count; the old entry goes stale
+        if current is not None:
+            if clicks > current:
+                self._push(short_code, clicks, url_data)
         
-        # If heap not full, just insert
-        if self.heap.size < self.k:
-            self.heap.insert(clicks, url_data)
-            self.url_map[short_code] = (clicks, url_data)
+        # If tracker not full, just insert
+        elif len(self.clicks_by_code) < self.k:
+            self._push(short_code, clicks, url_data)
         else:
             # If new URL has more clicks than minimum, replace minimum
-            min_clicks, _ = self.heap.get_min()
+            min_clicks, min_code = self._live_min()
             if clicks > min_clicks:
-                # Remove minimum
-                removed = self.heap.extract_min()
-                if removed:
-                    removed_code = removed[1].get('short_code')
-                    if removed_code in self.url_map:
-                        del self.url_map[removed_code]
-                
-                # Insert new URL
-                self.heap.insert(clicks, url_data)
-                self.url_map[short_code] = (clicks, url_data)
+                # Swap the minimum out for the new URL in a single sift
+                self.heap.replace_min(clicks, (short_code, url_data))
+                del self.clicks_by_code[min_code]
+                self.clicks_by_code[short_code] = clicks
+        
+        # Stale entries pile up on repeated updates; compact once they
+        # outnumber live ones so the heap stays O(k)
+        if self.heap.size > 2 * self.k:
+            self._rebuild_heap()
+    
+    def bulk_load(self, rows):
+        """
+        Load many URLs at once, keeping only the K most clicked
+        Selects the top K in one pass and builds the heap once
+        A URL already tracked keeps the higher click count: rows may be
+        older than counts recorded by add_or_update while they were loading
+        
+        Args:
+            rows (iterable): (short_code, clicks, url_data) tuples
+        """
+        candidates = {entry[1]: entry for entry in self._live_entries()}
+        for short_code, clicks, url_data in rows:
+            current = candidates.get(short_code)
+            if current is None or clicks > current[0]:
+                candidates[short_code] = (clicks, short_code, url_data)
+        
+        # itemgetter keys the selection in C instead of calling a lambda per row
+        top = heapq.nlargest(self.k, candidates.values(), key=itemgetter(0))
+        self.heap.clear()
+        self.clicks_by_code = {}
+        for clicks, short_code, url_data in top:
+            self._push(short_code, clicks, url_data)
+    
+    def _live_entries(self):
+        """
+        Get the current (clicks, short_code, url_data) entry of every tracked URL
+        """
+        clicks_by_code = self.clicks_by_code
+        seen = set()
+        entries = []
+        for clicks, (short_code, url_data) in self.heap.get_all_sorted()[::-1]:
+            if short_code not in seen and clicks_by_code.get(short_code) == clicks:
+                seen.add(short_code)
+                entries.append((clicks, short_code, url_data))
+        return entries
     
     def _rebuild_heap(self):
-        """Rebuild heap from url_map"""
+        """Rebuild heap from its live entries, dropping stale ones"""
+        entries = self._live_entries()
         self.heap.clear()
-        for short_code, (clicks, url_data) in self.url_map.items():
-            self.heap.insert(clicks, url_data)
+        for clicks, short_code, url_data in entries:
+            self.heap.insert(clicks, (short_code, url_data))
     
     def get_top_k(self):
         """
@@ -210,11 +272,10 @@ class TopKURLs:
         Returns:
             list: List of url_data dicts with click counts
         """
-        sorted_urls = self.heap.get_all_sorted()
-        # Reverse to get descending order (most clicks first)
-        return [(clicks, data) for clicks, data in reversed(sorted_urls)]
+        # Most clicks first, skipping stale entries
+        return [(clicks, url_data) for clicks, _, url_data in self._live_entries()]
     
     def clear(self):
         """Clear all tracked URLs"""
         self.heap.clear()
-        self.url_map.clear()
+        self.clicks_by_code.clear()
@@ -0,0 +1,174 @@
+"""
+Sharded Wrappers for HashMap and LRU Cache
+Splits one logical structure into N independent shards, each with its own lock
+Keys are routed by hash(key) & (N - 1), so every key always lands on the same shard
+"""
+
+import threading
+from .hash_map import HashMap
+from .lru_cache import LRUCache
+
+
+class _Sharded:
+    """
+    Common shard routing: power-of-two shard count, one lock per shard
+    """
+
+    def __init__(self, shards):
+        """
+        Args:
+            shards (list): Pre-built shard instances (length must be a power of two)
+        """
+        num_shards = len(shards)
+        if num_shards == 0 or num_shards & (num_shards - 1):
+            raise ValueError("Number of shards must be a power of two")
+
+        self.shards = shards
+        self.locks = [threading.Lock() for _ in shards]
+        self._mask = num_shards - 1
+
+    def _route(self, key):
+        """Return (shard, lock) responsible for key"""
+        index = hash(key) & self._mask
+        return self.shards[index], self.locks[index]
+
+    @property
+    def num_shards(self):
+        return len(self.shards)
+
+    @property
+    def size(self):
+        return sum(shard.size for shard in self.shards)
+
+    @property
+    def capacity(self):
+        return sum(shard.capacity for shard in self.shards)
+
+    def get(self, key):
+        shard, lock = self._route(key)
+        with lock:
+            return shard.get(key)
+
+    def put(self, key, value):
+        shard, lock = self._route(key)
+        with lock:
+            return shard.put(key, value)
+
+    def contains(self, key):
+        shard, lock = self._route(key)
+        with lock:
+            return shard.contains(key)
+
+    __contains__ = contains
+
+    def delete(self, key):
+        shard, lock = self._route(key)
+        with lock:
+            return shard.delete(key)
+
+    def clear(self):
+        """Clear every shard"""
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.clear()
+
+
+class ShardedHashMap(_Sharded):
+    """
+    HashMap split into N shards to reduce contention on a single table
+    Same put/get/contains/delete API as HashMap
+    """
+
+    def __init__(self, num_shards=16, initial_capacity=16):
+        """
+        Args:
+            num_shards (int): Number of shards (power of two)
+            initial_capacity (int): Total initial capacity, divided across shards
+        """
+        per_shard = max(1, -(-initial_capacity // num_shards))
+        super().__init__([HashMap(initial_capacity=per_shard) for _ in range(num_shards)])
+
+    def bulk_put(self, pairs):
+        """
+        Insert many key-value pairs, grouped so each shard is locked once
+
+        Args:
+            pairs (iterable): (key, value) tuples
+        """
+        grouped = [[] for _ in self.shards]
+        mask = self._mask
+        for key, value in pairs:
+            grouped[hash(key) & mask].append((key, value))
+
+        for shard, lock, shard_pairs in zip(self.shards, self.locks, grouped):
+            if shard_pairs:
+                with lock:
+                    shard.bulk_put(shard_pairs)
+
+    def get_stats(self):
+        """
+        Get statistics aggregated over all shards
+        """
+        shard_stats = [shard.get_stats() for shard in self.shards]
+        size = sum(s["size"] for s in shard_stats)
+        capacity = sum(s["capacity"] for s in shard_stats)
+        probed = sum(s["avg_probe_length"] * s["size"] for s in shard_stats)
+
+        return {
+            "size": size,
+            "capacity": capacity,
+            "load_factor": size / capacity if capacity else 0,
+            "collision_count": sum(s["collision_count"] for s in shard_stats),
+            "avg_probe_length": round(probed / size, 2) if size else 0,
+            "max_probe_length": max(s["max_probe_length"] for s in shard_stats),
+            "tombstones": sum(s["tombstones"] for s in shard_stats),
+            "shards": self.num_shards
+        }
+
+
+class ShardedLRUCache(_Sharded):
+    """
+    LRU Cache split into N shards, each evicting independently
+    Recency is tracked per shard, so eviction is approximately (not globally) LRU
+    """
+
+    def __init__(self, num_shards=16, capacity=100):
+        """
+        Args:
+            num_shards (int): Number of shards (power of two)
+            capacity (int): Total capacity, divided across shards
+        """
+        per_shard = max(1, -(-capacity // num_shards))
+        super().__init__([LRUCache(capacity=per_shard) for _ in range(num_shards)])
+
+    def get_stats(self):
+        """
+        Get cache statistics aggregated over all shards
+        """
+        shard_stats = [shard.get_stats() for shard in self.shards]
+        size = sum(s["size"] for s in shard_stats)
+        capacity = sum(s["capacity"] for s in shard_stats)
+        hits = sum(s["hits"] for s in shard_stats)
+        misses = sum(s["misses"] for s in shard_stats)
+        total_requests = hits + misses
+
+        return {
+            "size": size,
+            "capacity": capacity,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total_requests * 100, 2) if total_requests > 0 else 0,
+            "evictions": sum(s["evictions"] for s in shard_stats),
+            "utilization": round((size / capacity) * 100, 2),
+            "shards": self.num_shards
+        }
+
+    def get_all_keys(self):
+        """
+        Get all cached keys, shard by shard (most to least recent within a shard)
+        """
+        keys = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                keys.extend(shard.get_all_keys())
+        return keys
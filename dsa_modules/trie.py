@@ -2,15 +2,31 @@
 Trie (Prefix Tree) Implementation
 Used for URL search and autocomplete functionality
 Efficient prefix-based searching
+Path-compressed (radix tree): chains of single-child nodes are merged
+into one node whose edge holds the whole substring
 """
 
+import bisect
+import heapq
+
+
 class TrieNode:
     """Node in the Trie structure"""
-    def __init__(self):
-        self.children = {}  # char -> TrieNode
+    # No per-instance __dict__: less memory per node and faster attribute access
+    __slots__ = ('edge', 'children', 'is_end_of_word', 'url', 'frequency', 'top')
+    
+    def __init__(self, edge=""):
+        self.edge = edge  # Substring on the edge from the parent to this node
+        # first char of child's edge -> TrieNode; one-character strs are cached
+        # singletons with cached hashes, so int (ord) keys would save nothing
+        # on the one lookup made per edge
+        self.children = {}
         self.is_end_of_word = False
         self.url = None  # Store the full URL at end nodes
         self.frequency = 0  # Track how often this URL is accessed
+        # Cached best (frequency, url) entries in this subtree, most frequent
+        # first; None when a change below has invalidated it
+        self.top = None
 
 
 class Trie:
@@ -21,11 +37,29 @@ class Trie:
         - Insert: O(m) where m is length of URL
         - Search: O(m + k) where k is number of results
     Space Complexity: O(n * m) where n is number of URLs
+    
+    Children stay in per-node dicts rather than a compiled, read-only array
+    layout: every shorten request inserts, so a compiled form would be
+    invalidated and rebuilt between almost every pair of searches, and path
+    compression already leaves only one dict lookup per edge
     """
     
-    def __init__(self):
+    def __init__(self, top_k=10):
         self.root = TrieNode()
-        self.total_urls = 0
+        # Lowercased URL -> its end node, so exact-match operations
+        # (search, update_frequency, get_all_urls) skip the per-character walk
+        self._terminals = {}
+        # Nodes in the tree (root included), kept current by every mutation
+        # so get_stats does not walk the whole tree
+        self._node_count = 1
+        # Length of the per-node top lists; search_prefix calls asking for
+        # up to this many results read a node's list instead of its subtree
+        self.top_k = top_k
+    
+    @property
+    def total_urls(self):
+        """Number of URLs stored (one per end node)"""
+        return len(self._terminals)
     
     def insert(self, url, frequency=1):
         """
@@ -40,20 +74,156 @@ class Trie:
         
         node = self.root
         url_lower = url.lower()  # Case-insensitive search
+        length = len(url_lower)
+        pos = 0
         
-        for char in url_lower:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
-        
-        # Mark end of URL
-        if not node.is_end_of_word:
-            self.total_urls += 1
+        while pos < length:
+            node.top = None
+            char = url_lower[pos]
+            child = node.children.get(char)
+            
+            # No edge starts with this char: the rest of the URL becomes one leaf
+            if child is None:
+                child = TrieNode(url_lower[pos:])
+                node.children[char] = child
+                self._node_count += 1
+                node = child
+                break
+            
+            edge = child.edge
+            if url_lower.startswith(edge, pos):
+                node = child
+                pos += len(edge)
+                continue
+            
+            # URL diverges (or ends) inside the edge: split it at that point
+            split = 1
+            limit = min(len(edge), length - pos)
+            while split < limit and edge[split] == url_lower[pos + split]:
+                split += 1
+            
+            middle = TrieNode(edge[:split])
+            node.children[char] = middle
+            child.edge = edge[split:]
+            middle.children[child.edge[0]] = child
+            self._node_count += 1
+            node = middle
+            pos += split
         
+        # Mark end of URL (re-inserting an existing URL just overwrites it)
+        node.top = None
+        self._terminals[url_lower] = node
         node.is_end_of_word = True
         node.url = url  # Store original URL (with original case)
         node.frequency = frequency
     
+    def bulk_insert(self, urls_with_freq):
+        """
+        Insert many URLs at once
+        URLs are inserted in sorted order so shared prefixes are walked back to back
+        
+        Args:
+            urls_with_freq (iterable): (url, frequency) tuples
+        """
+        # An empty trie is built in one pass instead of URL by URL
+        if not self._terminals:
+            self._build_sorted(urls_with_freq)
+            return
+        
+        for url, frequency in sorted(urls_with_freq, key=lambda item: item[0].lower()):
+            self.insert(url, frequency)
+    
+    @classmethod
+    def from_sorted(cls, urls_with_freq, presorted=False):
+        """
+        Build a Trie from many URLs in one pass
+        
+        Args:
+            urls_with_freq (iterable): (url, frequency) tuples
+            presorted (bool): True if the input is already sorted by lowercased URL
+            
+        Returns:
+            Trie: New Trie holding the URLs
+        """
+        trie = cls()
+        trie._build_sorted(urls_with_freq, presorted)
+        return trie
+    
+    def _build_sorted(self, urls_with_freq, presorted=False):
+        """
+        Populate an empty Trie from URLs sorted by lowercased form
+        Every URL sharing a prefix sits in one contiguous run of the sorted
+        keys, so each node is created once with its final edge: a run's edge
+        is the common prefix of its first and last key, and its sub-runs are
+        found by binary search. No edge is ever split
+        
+        Args:
+            urls_with_freq (iterable): (url, frequency) tuples
+            presorted (bool): True if the input is already sorted by lowercased URL
+        """
+        # Later duplicates win, as with repeated insert calls
+        entries = {}
+        for url, frequency in urls_with_freq:
+            if url:
+                entries[url.lower()] = (url, frequency)
+        
+        keys = list(entries) if presorted else sorted(entries)
+        if not keys:
+            return
+        terminals = self._terminals
+        created = 0
+        self.root.top = None
+        
+        # Each task: keys[lo:hi] all lie below node, whose path is keys[lo][:depth]
+        stack = [(self.root, 0, len(keys), 0)]
+        while stack:
+            node, lo, hi, depth = stack.pop()
+            
+            # A key ending exactly here sorts first in its run
+            if len(keys[lo]) == depth:
+                key = keys[lo]
+                node.is_end_of_word = True
+                node.url, node.frequency = entries[key]
+                terminals[key] = node
+                lo += 1
+            
+            while lo < hi:
+                first = keys[lo]
+                char = first[depth]
+                
+                # Most runs are a single key, which becomes a leaf directly
+                if lo + 1 == hi or keys[lo + 1][depth] != char:
+                    leaf = TrieNode(first[depth:])
+                    leaf.is_end_of_word = True
+                    leaf.url, leaf.frequency = entries[first]
+                    terminals[first] = leaf
+                    node.children[char] = leaf
+                    created += 1
+                    lo += 1
+                    continue
+                
+                end = bisect.bisect_left(keys, first[:depth] + chr(ord(char) + 1), lo, hi)
+                
+                # Edge = common prefix of the run's first and last key,
+                # found by binary search over C-level startswith checks
+                last = keys[end - 1]
+                split = depth + 1
+                limit = min(len(first), len(last))
+                while split < limit:
+                    mid = (split + limit + 1) // 2
+                    if last.startswith(first[split:mid], split):
+                        split = mid
+                    else:
+                        limit = mid - 1
+                
+                child = TrieNode(first[depth:split])
+                node.children[char] = child
+                created += 1
+                stack.append((child, lo, end, split))
+                lo = end
+        
+        self._node_count += created
+    
     def search(self, url):
         """
         Search for exact URL match
@@ -64,12 +234,17 @@ class Trie:
         Returns:
             bool: True if URL exists, False otherwise
         """
-        node = self._find_node(url.lower())
-        return node is not None and node.is_end_of_word
+        # Stored keys are lowercase, so an already-lowercase URL matches as is
+        # and skips allocating a lowered copy
+        terminals = self._terminals
+        return url in terminals or url.lower() in terminals
+    
+    __contains__ = search
     
     def _find_node(self, prefix):
         """
-        Find the node corresponding to a prefix
+        Find the node whose subtree holds every URL starting with prefix
+        The prefix may end part-way along that node's edge
         
         Args:
             prefix (str): Prefix to search
@@ -78,10 +253,23 @@ class Trie:
             TrieNode: Node if found, None otherwise
         """
         node = self.root
-        for char in prefix:
-            if char not in node.children:
+        length = len(prefix)
+        pos = 0
+        
+        while pos < length:
+            child = node.children.get(prefix[pos])
+            if child is None:
                 return None
-            node = node.children[char]
+            
+            edge = child.edge
+            if prefix.startswith(edge, pos):
+                pos += len(edge)
+                node = child
+            elif edge.startswith(prefix[pos:]):
+                return child
+            else:
+                return None
+        
         return node
     
     def search_prefix(self, prefix, max_results=5):
@@ -104,27 +292,103 @@ class Trie:
         if node is None:
             return []
         
-        # Collect all URLs with this prefix
-        results = []
-        self._collect_urls(node, results)
+        if max_results <= 0:
+            return []
+        
+        # Served from the per-node cache when it holds enough entries
+        if max_results <= self.top_k:
+            return [(url, frequency) for frequency, url in self._node_top(node)[:max_results]]
+        
+        # Walk the subtree keeping only the best max_results in a min-heap
+        # of (frequency, url): O(N log k) instead of collecting and sorting all N
+        best = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.is_end_of_word:
+                entry = (current.frequency, current.url)
+                if len(best) < max_results:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+            stack.extend(current.children.values())
+        
+        # Sort by frequency (descending)
+        best.sort(reverse=True)
+        return [(url, frequency) for frequency, url in best]
+    
+    def _node_top(self, node):
+        """
+        Get the cached top_k (frequency, url) entries below a node, most frequent first
+        Missing caches in the subtree are filled bottom-up, each node merging
+        its own entry with its children's already-merged lists
+        
+        Args:
+            node (TrieNode): Subtree root
+            
+        Returns:
+            list: Up to top_k (frequency, url) tuples
+        """
+        if node.top is not None:
+            return node.top
+        
+        # Pre-order over uncached nodes; reversed, every child precedes its parent
+        order = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            order.append(current)
+            stack.extend(child for child in current.children.values() if child.top is None)
+        
+        k = self.top_k
+        for current in reversed(order):
+            candidates = [entry for child in current.children.values() for entry in child.top]
+            if current.is_end_of_word:
+                candidates.append((current.frequency, current.url))
+            current.top = heapq.nlargest(k, candidates)
+        
+        return node.top
+    
+    def _invalidate_path(self, url_lower):
+        """
+        Drop the cached top lists of every node on the path to url_lower
+        Only those subtrees contain the URL, every other cache stays valid
+        
+        Args:
+            url_lower (str): Lowercased URL whose frequency changed
+        """
+        node = self.root
+        node.top = None
+        length = len(url_lower)
+        pos = 0
         
-        # Sort by frequency (descending) and limit results
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:max_results]
+        while pos < length:
+            node = node.children.get(url_lower[pos])
+            if node is None or not url_lower.startswith(node.edge, pos):
+                return
+            node.top = None
+            pos += len(node.edge)
     
     def _collect_urls(self, node, results):
         """
-        Recursively collect all URLs from a node
+        Collect all URLs from a node
+        Iterative DFS with an explicit stack: no Python call per node and
+        no recursion limit on very long URLs
         
         Args:
             node (TrieNode): Starting node
             results (list): List to append results to
         """
-        if node.is_end_of_word:
-            results.append((node.url, node.frequency))
+        append = results.append
+        stack = [node]
+        pop = stack.pop
+        extend = stack.extend
         
-        for child in node.children.values():
-            self._collect_urls(child, results)
+        while stack:
+            current = pop()
+            if current.is_end_of_word:
+                append((current.url, current.frequency))
+            extend(current.children.values())
     
     def update_frequency(self, url):
         """
@@ -136,11 +400,17 @@ class Trie:
         Returns:
             bool: True if updated, False if URL not found
         """
-        url_lower = url.lower()
-        node = self._find_node(url_lower)
+        # Try the URL as given first: redirects usually pass it already
+        # lowercase, which saves allocating a lowered copy
+        url_lower = url
+        node = self._terminals.get(url)
+        if node is None:
+            url_lower = url.lower()
+            node = self._terminals.get(url_lower)
         
-        if node and node.is_end_of_word:
+        if node is not None:
             node.frequency += 1
+            self._invalidate_path(url_lower)
             return True
         return False
     
@@ -154,37 +424,53 @@ class Trie:
         Returns:
             bool: True if deleted, False if not found
         """
-        def _delete_helper(node, url_lower, index):
-            if index == len(url_lower):
-                if not node.is_end_of_word:
-                    return False
-                
-                node.is_end_of_word = False
-                node.url = None
-                node.frequency = 0
-                self.total_urls -= 1
-                
-                # Return True if node has no children (can be deleted)
-                return len(node.children) == 0
-            
-            char = url_lower[index]
-            if char not in node.children:
-                return False
-            
-            child_node = node.children[char]
-            should_delete_child = _delete_helper(child_node, url_lower, index + 1)
-            
-            if should_delete_child:
-                del node.children[char]
-                # Return True if current node can also be deleted
-                return not node.is_end_of_word and len(node.children) == 0
-            
-            return False
-        
         if not url:
             return False
         
-        return _delete_helper(self.root, url.lower(), 0)
+        # Same as update_frequency: only lower() when the URL is not stored as given
+        url_lower = url
+        end_node = self._terminals.pop(url, None)
+        if end_node is None:
+            url_lower = url.lower()
+            end_node = self._terminals.pop(url_lower, None)
+            if end_node is None:
+                return False
+        
+        # Walk down edge by edge, remembering (parent, char) for each step
+        path = []
+        node = self.root
+        pos = 0
+        while node is not end_node:
+            node.top = None
+            char = url_lower[pos]
+            path.append((node, char))
+            node = node.children[char]
+            pos += len(node.edge)
+        
+        node.is_end_of_word = False
+        node.url = None
+        node.frequency = 0
+        node.top = None
+        
+        # Unwind: drop nodes left empty, then merge a pass-through node
+        # (not an end, single child) into that child; the root is never touched
+        while path:
+            parent, char = path.pop()
+            if node.is_end_of_word:
+                break
+            if not node.children:
+                del parent.children[char]
+                self._node_count -= 1
+                node = parent
+                continue
+            if len(node.children) == 1:
+                (child,) = node.children.values()
+                child.edge = node.edge + child.edge
+                parent.children[char] = child
+                self._node_count -= 1
+            break
+        
+        return True
     
     def get_all_urls(self):
         """
@@ -193,9 +479,7 @@ class Trie:
         Returns:
             list: List of all URLs
         """
-        results = []
-        self._collect_urls(self.root, results)
-        return [url for url, _ in results]
+        return [node.url for node in self._terminals.values()]
     
     def get_stats(self):
         """
@@ -204,13 +488,7 @@ class Trie:
         Returns:
             dict: Statistics including total URLs, node count, etc.
         """
-        def count_nodes(node):
-            count = 1
-            for child in node.children.values():
-                count += count_nodes(child)
-            return count
-        
-        total_nodes = count_nodes(self.root)
+        total_nodes = self._node_count
         
         return {
             "total_urls": self.total_urls,
@@ -221,4 +499,5 @@ class Trie:
     def clear(self):
         """Clear all URLs from the Trie"""
         self.root = TrieNode()
-        self.total_urls = 0
+        self._terminals = {}
+        self._node_count = 1
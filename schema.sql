@@ -9,14 +9,23 @@ CREATE TABLE IF NOT EXISTS urls (
     clicks INTEGER DEFAULT 0,
     created_at TIMESTAMP DEFAULT NOW(),
     collision_resolved BOOLEAN DEFAULT FALSE,
-    resolution_strategy VARCHAR(20)
+    resolution_strategy VARCHAR(20),
+    is_custom BOOLEAN NOT NULL DEFAULT FALSE
 );
 
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_short_code ON urls(short_code);
 CREATE INDEX IF NOT EXISTS idx_clicks ON urls(clicks DESC);
 CREATE INDEX IF NOT EXISTS idx_created_at ON urls(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_original_url ON urls(original_url);
+-- Unique among auto-generated codes only, so shortening can upsert with
+-- ON CONFLICT (original_url) WHERE NOT is_custom; custom endpoints stay
+-- separate rows. Existing databases (keeps every row and short link):
+--   ALTER TABLE urls ADD COLUMN IF NOT EXISTS is_custom BOOLEAN NOT NULL DEFAULT FALSE;
+--   UPDATE urls u SET is_custom = TRUE WHERE EXISTS (
+--       SELECT 1 FROM urls o WHERE o.original_url = u.original_url AND o.id < u.id);
+--   DROP INDEX IF EXISTS idx_original_url;
+--   DROP INDEX IF EXISTS idx_original_url_unique;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_original_url_auto ON urls(original_url) WHERE NOT is_custom;
 
 -- Add comments for documentation
 COMMENT ON TABLE urls IS 'Stores shortened URLs with analytics';
@@ -27,6 +36,7 @@ COMMENT ON COLUMN urls.clicks IS 'Number of times the short URL was accessed';
 COMMENT ON COLUMN urls.created_at IS 'Timestamp when URL was created';
 COMMENT ON COLUMN urls.collision_resolved IS 'Whether collision detection was triggered';
 COMMENT ON COLUMN urls.resolution_strategy IS 'Strategy used to resolve collision (linear, regenerate, append)';
+COMMENT ON COLUMN urls.is_custom IS 'Whether the short code was a user-chosen custom endpoint';
 
 -- Optional: Create a function to automatically update clicks
 CREATE OR REPLACE FUNCTION increment_clicks(p_short_code VARCHAR)